@@ -1,5 +1,7 @@
 from flask import Flask, request, jsonify
 from pymongo import MongoClient
+from pymongo.errors import InvalidOperation
+from pymongo.monitoring import ConnectionPoolListener
 from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -8,7 +10,10 @@ from typing import Optional
 from werkzeug.exceptions import HTTPException
 from dateutil.parser import isoparse
 from flask_cors import CORS
+import multiprocessing
 import os
+import threading
+import time
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -16,15 +21,199 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 mongo_host = os.getenv('MONGO_HOST', 'localhost')  # Fallback zu 'localhost' falls MONGO_HOST nicht gesetzt ist
 mongo_port = int(os.getenv('MONGO_PORT', '27017'))  # Fallback zu '27017' falls MONGO_PORT nicht gesetzt ist
 
-# Verbinde mit der MongoDB-Datenbank
-client = MongoClient(host=mongo_host, port=mongo_port)
-db = client['test']
-collection_events = db['events']
-collection_todolists = db['todolists']
-collection_notes = db['notes']
-collection_recipes = db['recipes']
-collection_recommendations = db['recommendations']
-collection_gameConfigs = db['gameConfigs']
+mongo_max_pool_size = int(os.getenv('MONGO_MAX_POOL_SIZE', '100'))
+mongo_min_pool_size = int(os.getenv('MONGO_MIN_POOL_SIZE', '1'))  # gunicorn.conf.py setzt hier die Anzahl der Threads
+# Kurzes Timeout für die Server-Auswahl, damit ein nicht erreichbarer Server weder den Warm-up
+# noch eine Anfrage länger als ein paar Sekunden blockiert (pymongo-Standard wären 30 Sekunden)
+mongo_server_selection_timeout_ms = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+warm_up_timeout = float(os.getenv('WARM_UP_TIMEOUT', '10'))  # Sekunden, bis der Pool gefüllt sein muss
+
+# Zählt die offenen Verbindungen pro Server, damit der Warm-up auf minPoolSize warten kann
+# (minPoolSize gilt pro Server, z.B. je Mitglied eines Replica Sets)
+class PoolMonitor(ConnectionPoolListener):
+    def __init__(self):
+        self.open_connections = {}
+        self.condition = threading.Condition()
+
+    def connection_created(self, event):
+        with self.condition:
+            self.open_connections[event.address] = self.open_connections.get(event.address, 0) + 1
+            self.condition.notify_all()
+
+    def connection_closed(self, event):
+        with self.condition:
+            self.open_connections[event.address] = self.open_connections.get(event.address, 0) - 1
+
+    def count(self, address):
+        # Ohne eindeutigen Server (mehrere mongos) zählt der am besten gefüllte Pool
+        if address is None:
+            return max(self.open_connections.values(), default=0)
+        return self.open_connections.get(address, 0)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+# Der MongoClient ist nicht fork-sicher: er wird deshalb erst bei der ersten Verwendung
+# und pro Prozess (also pro Gunicorn-Worker nach dem Fork) erzeugt
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+_pool_monitor = None
+
+# Wird gesetzt, sobald der Warm-up in diesem Prozess abgeschlossen ist (siehe /ready)
+warmed_up = threading.Event()
+
+# Zustand aller Gunicorn-Worker in geteiltem Speicher, damit /ready auch über die anderen
+# Worker Auskunft gibt. Wird von gunicorn.conf.py im Master vor dem Fork angelegt; beim
+# Entwicklungsserver bleibt er None. Ohne Lock: jeder Platz ist ein einzelnes Byte, Leser
+# brauchen nur einen ungefähren Stand, und ein per SIGKILL beendeter Worker dürfte sonst
+# den Lock halten und den Master in child_exit blockieren.
+WORKER_FREE, WORKER_STARTING, WORKER_READY = 0, 1, 2
+worker_states = None
+worker_slot = None
+
+def init_worker_states(count):
+    global worker_states
+    worker_states = multiprocessing.Array('b', count, lock=False)
+
+def set_worker_state(slot, state):
+    if worker_states is not None and slot is not None and slot < len(worker_states):
+        worker_states[slot] = state
+
+def get_client():
+    global _client, _client_pid, _pool_monitor
+
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                # Einen vom Elternprozess geerbten Client nicht schließen, nur verwerfen
+                _pool_monitor = PoolMonitor()
+                _client = MongoClient(
+                    host=mongo_host,
+                    port=mongo_port,
+                    maxPoolSize=mongo_max_pool_size,
+                    minPoolSize=mongo_min_pool_size,
+                    serverSelectionTimeoutMS=mongo_server_selection_timeout_ms,
+                    event_listeners=[_pool_monitor],
+                    connect=False,
+                )
+                _client_pid = pid
+                warmed_up.clear()
+    return _client
+
+def get_db():
+    return get_client()['test']
+
+# Stellvertreter für eine Collection, der erst beim Zugriff den Client des aktuellen Prozesses verwendet
+class LazyCollection:
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(get_db()[self.name], attr)
+
+collection_events = LazyCollection('events')
+collection_todolists = LazyCollection('todolists')
+collection_notes = LazyCollection('notes')
+collection_recipes = LazyCollection('recipes')
+collection_recommendations = LazyCollection('recommendations')
+collection_gameConfigs = LazyCollection('gameConfigs')
+all_collections = [
+    collection_events,
+    collection_todolists,
+    collection_notes,
+    collection_recipes,
+    collection_recommendations,
+    collection_gameConfigs,
+]
+
+def warm_up(notify=None):
+    """Öffnet Verbindungen im Pool und lädt die Collections vor, bevor Anfragen angenommen werden.
+
+    `notify` wird zwischen den Schritten aufgerufen (z.B. worker.notify von Gunicorn),
+    damit der Worker während des Warm-ups nicht als hängend gilt.
+    """
+    notify = notify or (lambda: None)
+    deadline = time.monotonic() + warm_up_timeout
+    client = get_client()
+    monitor = _pool_monitor
+
+    # Server-Auswahl und Handshake einmalig durchführen; öffnet dabei auch den Pool
+    client.admin.command('ping')
+    try:
+        # Der Server, an den der Ping ging (Primary bzw. mongos), ist der, der aufgewärmt sein muss
+        address = client.address
+    except InvalidOperation:
+        address = None
+    notify()
+
+    # Metadaten und erste Dokumente jeder Collection einmal lesen
+    for collection in all_collections:
+        collection.find_one()
+        notify()
+
+    # pymongo füllt den Pool im Hintergrund bis minPoolSize auf; darauf warten
+    with monitor.condition:
+        while monitor.count(address) < mongo_min_pool_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Pool hat nach {warm_up_timeout}s nur {monitor.count(address)} "
+                    f"von {mongo_min_pool_size} Verbindungen"
+                )
+            monitor.condition.wait(min(remaining, 1))
+            notify()
+
+    warmed_up.set()
+    set_worker_state(worker_slot, WORKER_READY)
+
+def _retry_warm_up():
+    delay = 1
+    while not warmed_up.is_set():
+        time.sleep(delay)
+        try:
+            warm_up()
+        except Exception as e:
+            print("Warm-up fehlgeschlagen:", str(e))
+            delay = min(delay * 2, 30)
+
+def start_warm_up(notify=None):
+    """Führt den Warm-up aus; schlägt er fehl, wird er im Hintergrund mit Backoff wiederholt.
+
+    Gibt True zurück, wenn der erste Versuch erfolgreich war.
+    """
+    try:
+        warm_up(notify)
+        return True
+    except Exception as e:
+        print("Warm-up fehlgeschlagen, wird im Hintergrund wiederholt:", str(e))
+    threading.Thread(target=_retry_warm_up, daemon=True).start()
+    return False
 
 # Pydantic-Modell für das Event
 class Event(BaseModel):
@@ -646,5 +835,26 @@ def delete_gameConfig():
     except Exception as e:
         return jsonify({'error': str(e)}), 500    
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    pid = os.getpid()
+    worker_ready = warmed_up.is_set() and _client_pid == pid
+
+    # Unter Gunicorn bereit, sobald dieser Worker und mindestens ein erfasster Worker aufgewärmt
+    # sind; Worker, die noch im Warm-up stecken, werden nur zur Information mitgeliefert
+    if worker_states is not None:
+        states = worker_states[:]
+        workers = {
+            "ready": states.count(WORKER_READY),
+            "starting": states.count(WORKER_STARTING),
+        }
+        is_ready = worker_ready and workers["ready"] > 0
+        return jsonify({"ready": is_ready, "pid": pid, "workers": workers}), 200 if is_ready else 503
+
+    if worker_ready:
+        return jsonify({"ready": True, "pid": pid})
+    return jsonify({"ready": False, "pid": pid}), 503
+
 if __name__ == '__main__':
-	 app.run(host='localhost', port=8000)
+	 start_warm_up()
+	 app.run(host='localhost', port=8000, threaded=True)
@@ -0,0 +1,57 @@
+# Produktions-Konfiguration für Gunicorn
+# Start: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+# Mehrere Worker-Prozesse mit je mehreren Threads (gthread)
+workers = int(os.getenv('WEB_WORKERS', str(multiprocessing.cpu_count() * 2 + 1)))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '4'))
+
+# Eine offene Mongo-Verbindung pro Thread; wird von app.py beim Import gelesen
+os.environ.setdefault('MONGO_MIN_POOL_SIZE', str(threads))
+
+# Die App wird einmal im Master geladen; der MongoClient wird erst in jedem Worker erzeugt
+preload_app = True
+
+# Der Warm-up meldet sich zwischen den Schritten per worker.notify(); jeder Schritt ist durch
+# MONGO_SERVER_SELECTION_TIMEOUT_MS (Standard 5s) begrenzt und bleibt damit deutlich darunter
+timeout = int(os.getenv('WEB_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('WEB_KEEPALIVE', '5'))
+
+def on_starting(server):
+    # Geteilter Zustand aller Worker für /ready, vor dem ersten Fork anlegen. Doppelt so viele
+    # Plätze wie Worker, weil bei einem Reload (SIGHUP) die neuen Worker starten, während die
+    # alten noch laufen und ihre Plätze belegen
+    import app
+
+    app.init_worker_states(2 * server.num_workers)
+
+def pre_fork(server, worker):
+    # Freien Platz im geteilten Zustand reservieren; sind alle Plätze belegt (z.B. nach
+    # mehrfachem TTIN), wird der Worker nicht erfasst
+    import app
+
+    used = {getattr(w, 'slot', None) for w in server.WORKERS.values()}
+    worker.slot = next((i for i in range(len(app.worker_states)) if i not in used), None)
+    app.set_worker_state(worker.slot, app.WORKER_STARTING)
+
+def child_exit(server, worker):
+    import app
+
+    app.set_worker_state(getattr(worker, 'slot', None), app.WORKER_FREE)
+
+def post_worker_init(worker):
+    # Läuft im Worker nach dem Fork, bevor er Anfragen annimmt
+    import app
+
+    app.worker_slot = worker.slot
+    if app.start_warm_up(notify=worker.notify):
+        worker.log.info("Warm-up abgeschlossen (pid %s)", worker.pid)
+    else:
+        # Worker trotzdem starten; der Warm-up wird im Hintergrund wiederholt und
+        # /ready meldet bis dahin 503
+        worker.log.warning("Warm-up fehlgeschlagen, Wiederholung im Hintergrund (pid %s)", worker.pid)